@@ -1,35 +1,77 @@
 # <<< Connection Refused 해결 및 2개월 조회/자동 누적 최종 버전 main.py >>>
 
 import os
+import atexit
 import requests
 import pandas as pd
 import gspread
-from gspread_dataframe import set_with_dataframe
+from gspread.utils import rowcol_to_a1
 import xml.etree.ElementTree as ET
-import time
 import ssl
+import time
+import threading
 from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
+from collections import defaultdict
 from datetime import datetime, timedelta
 from dateutil.relativedelta import relativedelta
 
+# SSL 컨텍스트는 모듈 로드 시 한 번만 만들고, 인증서 검증은 그대로 켜 둔 채 모든 연결에서 재사용합니다.
+SSL_CONTEXT = ssl.create_default_context()
+SSL_CONTEXT.set_ciphers('DEFAULT@SECLEVEL=1')
+
 class CustomHttpAdapter(HTTPAdapter):
-    def __init__(self, *args, **kwargs):
-        self.ssl_context = ssl.create_default_context()
-        self.ssl_context.set_ciphers('DEFAULT@SECLEVEL=1')
+    def __init__(self, *args, ssl_context=SSL_CONTEXT, **kwargs):
+        self.ssl_context = ssl_context
         super().__init__(*args, **kwargs)
     def init_poolmanager(self, connections, maxsize, block=False):
         self.poolmanager = requests.urllib3.PoolManager(
             num_pools=connections, maxsize=maxsize, block=block, ssl_context=self.ssl_context
         )
 
+def get_positive_env(name, default, cast):
+    # 환경 변수가 비었거나, 숫자가 아니거나, 0 이하이면 기본값을 사용합니다.
+    value = os.getenv(name)
+    if not value: return default
+    try:
+        parsed = cast(value)
+    except ValueError:
+        parsed = 0
+    if not parsed > 0:
+        print(f"경고: {name} 값 '{value}'이(가) 올바르지 않아 기본값 {default}을(를) 사용합니다.")
+        return default
+    return parsed
+
 # --- 설정 변수 ---
 SERVICE_KEY = os.getenv('SERVICE_KEY')
 GOOGLE_CREDENTIALS_JSON = os.getenv('GOOGLE_CREDENTIALS_JSON')
 GOOGLE_SHEET_NAME = '전국 아파트 매매 실거래가_최근 2개월'
 LAWD_CODE_FILE = 'lawd_code.csv'
+# 중복 확인용 unique_id를 만드는 열 목록입니다.
+UNIQUE_ID_COLUMNS = ['거래금액', '년', '월', '일', '전용면적', '지번', '층', '법정동시군구코드', '법정동읍면동코드']
+# [분할 업로드] 한 번의 append 요청에 담을 최대 행 수입니다. 요청 크기 제한과 타임아웃을 피합니다.
+UPLOAD_CHUNK_ROWS = 2000
+# [해결 방안 2] GitHub Secret에 PROXY_URL이 설정된 경우에만 프록시를 사용합니다.
+PROXY_URL = os.getenv('PROXY_URL')
+# 세션에 둔 프록시는 HTTP(S)_PROXY 환경 변수에 덮어써지므로, 요청마다 proxies=로 넘겨 PROXY_URL이 우선하게 합니다.
+PROXIES = {'http': PROXY_URL, 'https': PROXY_URL} if PROXY_URL else None
 
 BASE_URL = 'https://openapi.molit.go.kr/OpenAPI_ToolInstallPackage/service/rest/RTMSOBJSvc/getRTMSDataSvcAptTrade'
+# 한 페이지에 요청할 최대 건수입니다. totalCount가 이보다 크면 나머지 페이지를 이어서 요청합니다.
+NUM_OF_ROWS = 9999
+
+# [동시 수집] 지역별 요청을 동시에 보낼 최대 스레드 수입니다. 커넥션 풀 크기도 이 값에 맞춥니다.
+# API 서버 상황에 따라 MAX_WORKERS 환경 변수로 조절할 수 있습니다.
+MAX_WORKERS = get_positive_env('MAX_WORKERS', 8, int)
+# [요청 속도 제한] 모든 스레드를 합쳐 초당 보낼 최대 요청 수입니다. 대기 중인 스레드만 멈추고 나머지는 계속 진행합니다.
+# 단, 아래 RETRY_STRATEGY로 urllib3가 다시 보내는 요청은 제한기를 거치지 않아 재시도가 몰리면 잠시 이 값을 넘을 수 있습니다.
+REQUESTS_PER_SECOND = get_positive_env('REQUESTS_PER_SECOND', 10.0, float)
+# [재시도] 네트워크 오류와 429/5xx 응답은 urllib3가 지수 백오프로 재시도합니다. 429의 Retry-After 헤더도 따릅니다.
+RETRY_STRATEGY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=['GET'])
+# [본문 재시도] stream=True로 받는 본문은 Retry 밖에서 읽히므로, 본문 수신 중 끊기면 이 횟수까지 다시 요청합니다.
+BODY_READ_ATTEMPTS = 3
 
 # [날짜 로직] 현재 코드는 요청하신 대로 최근 2개월(이번 달, 지난 달)을 올바르게 계산합니다.
 today_kst = datetime.utcnow() + timedelta(hours=9)
@@ -38,6 +80,33 @@ for i in range(2):
     target_date = today_kst - relativedelta(months=i)
     MONTHS_TO_FETCH.append(target_date.strftime('%Y%m'))
 
+class RateLimiter:
+    def __init__(self, max_rate):
+        self.interval = 1.0 / max_rate
+        self.lock = threading.Lock()
+        self.next_time = time.monotonic()
+    def wait(self):
+        # 다음 요청 시각을 잠금 안에서 예약만 하고, 실제 대기는 잠금 밖에서 합니다.
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait_time > 0: time.sleep(wait_time)
+
+def create_session():
+    session = requests.Session()
+    adapter = CustomHttpAdapter(pool_connections=MAX_WORKERS, pool_maxsize=MAX_WORKERS, max_retries=RETRY_STRATEGY)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
+    session.headers.update(headers)
+    return session
+
+# 모든 요청이 하나의 세션(커넥션 풀, keep-alive)을 공유합니다.
+SESSION = create_session()
+atexit.register(SESSION.close)
+RATE_LIMITER = RateLimiter(REQUESTS_PER_SECOND)
+
 def get_google_creds():
     if GOOGLE_CREDENTIALS_JSON is None:
         print("오류: GitHub Secrets에 'GOOGLE_CREDENTIALS_JSON'이 설정되지 않았습니다.")
@@ -50,91 +119,192 @@ def get_google_creds():
 
 def get_lawd_codes(filepath):
     try:
-        df = pd.read_csv(filepath)
-        print(f"총 {len(df['code'])}개의 지역 코드를 불러왔습니다.")
-        return df['code'].astype(str).tolist()
+        # code 열만 문자열로 읽어 이후 astype(str) 변환 없이 바로 사용합니다.
+        df = pd.read_csv(filepath, usecols=['code'], dtype={'code': str})
+        codes = df['code'].dropna().str.strip()
+        # 5자리 숫자이면서 시/도 단위(000으로 끝나는) 코드가 아닌 것만 남깁니다.
+        valid = codes.str.fullmatch(r'[0-9]{5}') & ~codes.str.endswith('000')
+        # 같은 시/도 코드끼리 이어서 요청되도록 코드 순으로 정렬합니다.
+        codes = codes[valid].sort_values()
+        print(f"총 {len(codes)}개의 지역 코드를 불러왔습니다.")
+        return codes.tolist()
     except FileNotFoundError:
         print(f"오류: {filepath} 파일을 찾을 수 없습니다.")
         return []
 
-def fetch_data_for_region(session, lawd_cd, deal_ymd, service_key):
-    params = {'serviceKey': service_key, 'LAWD_CD': lawd_cd, 'DEAL_YMD': deal_ymd, 'pageNo': '1', 'numOfRows': '9999'}
+def iter_xml_events(response, events=('end',), chunk_size=65536):
+    # 응답 본문을 청크 단위로 받으면서 파싱해, (이벤트, 요소)를 도착하는 대로 내보냅니다.
+    parser = ET.XMLPullParser(events=events)
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        parser.feed(chunk)
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
 
-    # [해결 방안 2] GitHub Secret에 PROXY_URL이 설정된 경우에만 프록시를 사용합니다.
-    proxy_url = os.getenv('PROXY_URL')
-    proxies = None
-    if proxy_url:
-        proxies = { 'http': proxy_url, 'https': proxy_url }
+def fetch_page(session, lawd_cd, deal_ymd, service_key, page_no):
+    params = {'serviceKey': service_key, 'LAWD_CD': lawd_cd, 'DEAL_YMD': deal_ymd, 'pageNo': str(page_no), 'numOfRows': str(NUM_OF_ROWS)}
 
-    for attempt in range(3):
+    # 연결 단계의 재시도는 세션에 마운트된 RETRY_STRATEGY가 담당합니다.
+    for attempt in range(BODY_READ_ATTEMPTS):
+        headers_received = False
         try:
-            response = session.get(BASE_URL, params=params, timeout=60, proxies=proxies)
-            response.raise_for_status()
-            all_items = []
-            root = ET.fromstring(response.content)
-            result_code_element = root.find('header/resultCode')
-            if result_code_element is None or result_code_element.text != '00':
-                if result_code_element is None or result_code_element.text != '99':
-                    msg_element = root.find('header/resultMsg')
-                    msg = msg_element.text if msg_element is not None else "메시지 없음"
-                    print(f"\n  [API 응답 오류] 지역코드: {lawd_cd}, 메시지: {msg}")
-                return []
-            items_element = root.find('body/items')
-            if items_element is None: return []
-            for item in items_element.findall('item'):
-                item_dict = {child.tag: child.text.strip() if child.text else '' for child in item}
-                all_items.append(item_dict)
-            return all_items
+            RATE_LIMITER.wait()
+            with session.get(BASE_URL, params=params, timeout=60, stream=True, proxies=PROXIES) as response:
+                response.raise_for_status()
+                headers_received = True
+                # 본문 전체를 메모리에 올리거나 트리를 만들지 않고, <item>을 하나씩 처리한 뒤 바로 비웁니다.
+                # 행(dict) 목록 대신 열 단위 리스트로 바로 모읍니다. 항목에 없는 태그는 빈 문자열로 채웁니다.
+                result_code, result_msg, total_count = None, None, 0
+                columns = defaultdict(list)
+                n_rows = 0
+                items_element = None
+                for event, elem in iter_xml_events(response, events=('start', 'end')):
+                    if event == 'start':
+                        if elem.tag == 'items': items_element = elem
+                        continue
+                    if elem.tag == 'item':
+                        for child in elem:
+                            column = columns[child.tag]
+                            column.extend([''] * (n_rows - len(column)))
+                            column.append(child.text.strip() if child.text else '')
+                        n_rows += 1
+                        # 처리한 <item>은 부모에서 떼어내 응답 크기와 무관하게 메모리를 일정하게 유지합니다.
+                        elem.clear()
+                        if items_element is not None: items_element.remove(elem)
+                    elif elem.tag == 'resultCode':
+                        result_code = elem.text
+                    elif elem.tag == 'resultMsg':
+                        result_msg = elem.text
+                    elif elem.tag == 'totalCount':
+                        total_count = int(elem.text) if elem.text and elem.text.strip().isdigit() else 0
+                    elif elem.tag == 'header' and result_code != '00':
+                        break
+                if result_code != '00':
+                    if result_code != '99':
+                        msg = result_msg if result_msg is not None else "메시지 없음"
+                        print(f"\n  [API 응답 오류] 지역코드: {lawd_cd}, 메시지: {msg}")
+                    return {}, 0
+                for column in columns.values():
+                    column.extend([''] * (n_rows - len(column)))
+                return dict(columns), total_count
         except requests.exceptions.ProxyError as e:
-            print(f"\n  [프록시 오류] 지역코드: {lawd_cd} (시도 {attempt + 1}/3). 프록시 서버를 확인하세요.")
-            time.sleep(5)
+            print(f"\n  [프록시 오류] 지역코드: {lawd_cd}, 최종 접속 실패. 프록시 서버를 확인하세요.")
         except requests.exceptions.RequestException as e:
-            print(f"\n  [네트워크 오류] 지역코드: {lawd_cd} (시도 {attempt + 1}/3). 오류 유형: {type(e).__name__}")
-            time.sleep(5)
+            # 응답 헤더를 받은 뒤 본문을 읽다 끊긴 오류는 urllib3 Retry가 다루지 않으므로 여기서 다시 시도합니다.
+            if headers_received and attempt + 1 < BODY_READ_ATTEMPTS:
+                print(f"\n  [본문 수신 오류] 지역코드: {lawd_cd} (시도 {attempt + 1}/{BODY_READ_ATTEMPTS}). 오류 유형: {type(e).__name__}")
+                time.sleep(5)
+                continue
+            print(f"\n  [네트워크 오류] 지역코드: {lawd_cd}, 최종 접속 실패. 오류 유형: {type(e).__name__}")
         except ET.ParseError as e:
             print(f"\n  [XML 파싱 오류] 지역코드: {lawd_cd}, 오류: {e}")
-            return []
-    print(f"\n  [네트워크 오류] 지역코드: {lawd_cd}, 최종 접속 실패.")
-    return []
+        return {}, 0
+
+def fetch_data_for_region(session, lawd_cd, deal_ymd, service_key):
+    columns, total_count = fetch_page(session, lawd_cd, deal_ymd, service_key, 1)
+    # [페이지 처리] 거래가 한 페이지를 넘는 지역은 나머지 페이지를 이어서 받아 합칩니다.
+    # 서버가 numOfRows를 더 작게 제한할 수 있으므로, 요청한 값이 아니라 1페이지에서 실제로 받은 건수로 페이지 수를 계산합니다.
+    page_size = len(next(iter(columns.values()))) if columns else 0
+    if page_size == 0: return columns
+    n_pages = -(-total_count // page_size)
+    for page_no in range(2, n_pages + 1):
+        page_columns, _ = fetch_page(session, lawd_cd, deal_ymd, service_key, page_no)
+        if not page_columns:
+            print(f"\n  [페이지 누락] 지역코드: {lawd_cd}, {deal_ymd} {page_no}/{n_pages}페이지를 받지 못해 일부 데이터만 반영됩니다.")
+            continue
+        extend_columns(columns, page_columns)
+    return columns
+
+def fetch_all_regions(session, lawd_codes, months, service_key):
+    # [동시 수집] 모든 (월, 지역) 조합을 하나의 스레드 풀에서 한꺼번에 요청합니다.
+    tasks = [(month, code) for month in months for code in lawd_codes]
+    results = {}
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(fetch_data_for_region, session, code, month, service_key): (month, code) for month, code in tasks}
+        for i, future in enumerate(as_completed(futures)):
+            month, code = futures[future]
+            results[(month, code)] = future.result()
+            print(f"\r  [{i+1}/{len(tasks)}] {month} {code} 수집 완료...", end="", flush=True)
+    return results
+
+def extend_columns(columns, new_columns):
+    # 열 단위 dict를 이어 붙입니다. 한쪽에만 있는 열은 빈 문자열로 채워 길이를 맞춥니다.
+    if not new_columns: return columns
+    n_old = len(next(iter(columns.values()))) if columns else 0
+    n_new = len(next(iter(new_columns.values())))
+    for tag in columns.keys() - new_columns.keys():
+        columns[tag].extend([''] * n_new)
+    for tag, values in new_columns.items():
+        if tag not in columns:
+            columns[tag] = [''] * n_old
+        columns[tag].extend(values)
+    return columns
 
 def create_unique_id(df):
     if df.empty: return df
-    id_cols = ['거래금액', '년', '월', '일', '전용면적', '지번', '층', '법정동시군구코드', '법정동읍면동코드']
-    valid_cols = [col for col in id_cols if col in df.columns]
-    df['unique_id'] = df[valid_cols].astype(str).agg('_'.join, axis=1)
+    valid_cols = [col for col in UNIQUE_ID_COLUMNS if col in df.columns]
+    # 행마다 파이썬 join을 호출하지 않고 열 단위 str.cat으로 한 번에 이어 붙입니다.
+    id_parts = [df[col].astype(str) for col in valid_cols]
+    df['unique_id'] = id_parts[0].str.cat(id_parts[1:], sep='_')
     return df
 
-def find_and_upload_new_data(df_new, df_existing, worksheet):
-    if df_new.empty: return 0, df_existing
+def get_existing_ids(worksheet, sheet_headers):
+    # 시트 전체가 아니라 unique_id에 필요한 열만 한 번의 batch_get으로 읽어옵니다.
+    id_cols = [col for col in UNIQUE_ID_COLUMNS if col in sheet_headers]
+    if not id_cols: return set()
+    ranges = []
+    for col in id_cols:
+        col_letter = rowcol_to_a1(1, sheet_headers.index(col) + 1)[:-1]
+        ranges.append(f"{col_letter}2:{col_letter}")
+    # 기본값(FORMATTED_VALUE)으로 읽어야 거래금액이 "82,500"처럼 수집 데이터와 같은 문자열로 돌아와 ID가 일치합니다.
+    value_ranges = worksheet.batch_get(ranges, major_dimension='COLUMNS')
+    columns = [value_range[0] if value_range else [] for value_range in value_ranges]
+    n_rows = max(len(values) for values in columns)
+    if n_rows == 0: return set()
+    # 끝쪽 빈 칸은 응답에서 생략되므로 빈 문자열로 채워 길이를 맞춥니다.
+    df_existing = pd.DataFrame({col: values + [''] * (n_rows - len(values)) for col, values in zip(id_cols, columns)})
+    return set(create_unique_id(df_existing)['unique_id'])
+
+def find_new_data(df_new, existing_ids):
+    if df_new.empty: return df_new
     df_new = create_unique_id(df_new)
-    if not df_existing.empty:
-        if 'unique_id' not in df_existing.columns:
-            df_existing = create_unique_id(df_existing)
-        newly_added_df = df_new[~df_new['unique_id'].isin(df_existing['unique_id'])].copy()
-    else:
-        newly_added_df = df_new.copy()
-
-    if newly_added_df.empty: return 0, df_existing
-    added_count = len(newly_added_df)
+    newly_added_df = df_new[~df_new['unique_id'].isin(existing_ids)].copy()
+    # 기존 데이터를 매달 다시 합치지 않고, 신규 ID만 집합에 추가해 다음 달 중복 확인에 사용합니다.
+    existing_ids.update(newly_added_df['unique_id'])
+    return newly_added_df
+
+def upload_new_data(df_new, worksheet, sheet_headers):
+    # [일괄 업로드] 모든 달의 신규 데이터를 모아 시트에 한 번만 씁니다.
+    # 헤더는 main()에서 처음 읽어 둔 값을 그대로 사용하므로 시트를 다시 읽지 않습니다.
+    added_count = len(df_new)
     print(f"\n총 {added_count}건의 신규 데이터를 확인했습니다. 시트에 추가합니다.")
-    df_to_upload = newly_added_df.drop(columns=['unique_id'])
-    
+    df_to_upload = df_new.drop(columns=['unique_id'])
+
+    # 블록 단위로 쓰므로 중간에 실패해도 앞서 쓴 블록은 시트에 남습니다. 실제로 쓴 행 수를 따로 셉니다.
+    written_count = 0
     try:
-        if worksheet.row_count < 2:
-             set_with_dataframe(worksheet, df_to_upload, include_index=False, allow_formulas=False)
-        else:
-            sheet_headers = [col.strip() for col in worksheet.row_values(1)]
-            df_aligned = pd.DataFrame(columns=sheet_headers)
-            for col in sheet_headers:
-                if col in df_to_upload.columns:
-                    df_aligned[col] = df_to_upload[col]
-            worksheet.append_rows(df_aligned.values.tolist(), value_input_option='USER_ENTERED')
-        
-        df_existing_updated = pd.concat([df_existing, newly_added_df], ignore_index=True)
-        return added_count, df_existing_updated
+        if not sheet_headers:
+            # 빈 시트에는 헤더 한 줄만 update로 쓰고, 데이터는 아래 append 경로로 이어서 씁니다.
+            sheet_headers = list(df_to_upload.columns)
+            # 새로 만든 시트는 26열뿐이므로, 헤더가 더 길면 먼저 열을 늘려야 범위 초과 오류가 나지 않습니다.
+            if worksheet.col_count < len(sheet_headers):
+                worksheet.add_cols(len(sheet_headers) - worksheet.col_count)
+            worksheet.update('A1', [sheet_headers], value_input_option='USER_ENTERED')
+        # 열 구성과 순서가 이미 시트 헤더와 같으면 reindex 복사를 건너뜁니다.
+        df_aligned = df_to_upload
+        if list(df_to_upload.columns) != sheet_headers:
+            df_aligned = df_to_upload.reindex(columns=sheet_headers, fill_value='')
+        rows = df_aligned.to_numpy(dtype=object).tolist()
+        for start in range(0, len(rows), UPLOAD_CHUNK_ROWS):
+            chunk = rows[start:start + UPLOAD_CHUNK_ROWS]
+            worksheet.append_rows(chunk, value_input_option='USER_ENTERED')
+            written_count += len(chunk)
+            print(f"  [{start + len(chunk)}/{len(rows)}] 행 업로드 완료")
+        return added_count
     except Exception as e:
         print(f"\n시트 쓰기 중 오류 발생: {e}")
-        return -1, df_existing
+        print(f"  오류 전까지 {written_count}/{added_count}건이 시트에 추가되었습니다. 나머지는 다음 실행에서 신규로 다시 확인됩니다.")
+        return written_count
 
 def main():
     if not SERVICE_KEY:
@@ -149,18 +319,17 @@ def main():
     lawd_codes = get_lawd_codes(LAWD_CODE_FILE)
     if not lawd_codes: return
     
-    df_existing = pd.DataFrame()
+    existing_ids = set()
+    sheet_headers = []
     try:
         creds = get_google_creds()
         if not creds: return
         gc = gspread.service_account_from_dict(creds)
         sh = gc.open(GOOGLE_SHEET_NAME)
         worksheet = sh.get_worksheet(0)
-        print("구글 시트에서 기존 데이터를 딱 한 번만 읽어옵니다...")
-        existing_records = worksheet.get_all_records()
-        if existing_records:
-            df_existing = pd.DataFrame(existing_records)
-            df_existing.columns = df_existing.columns.str.strip()
+        print("구글 시트에서 헤더와 중복 확인용 열만 한 번 읽어옵니다...")
+        sheet_headers = [col.strip() for col in worksheet.row_values(1)]
+        existing_ids = get_existing_ids(worksheet, sheet_headers)
     except gspread.exceptions.SpreadsheetNotFound:
         print(f"경고: '{GOOGLE_SHEET_NAME}' 시트를 찾을 수 없어 새로 생성합니다.")
         sh = gc.create(GOOGLE_SHEET_NAME)
@@ -173,40 +342,41 @@ def main():
         print(f"구글 시트 초기화 중 오류 발생: {e}")
         return
 
-    session = requests.Session()
-    session.mount('https://', CustomHttpAdapter())
-    headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'}
-    session.headers.update(headers)
-    total_added_count = 0
-    
+    print(f"\n--- {len(MONTHS_TO_FETCH)}개월 x {len(lawd_codes)}개 지역 데이터 수집 시작 ---")
+    region_results = fetch_all_regions(SESSION, lawd_codes, MONTHS_TO_FETCH, SERVICE_KEY)
+
+    new_frames = []
     for month in MONTHS_TO_FETCH:
         print(f"\n--- {month} 데이터 처리 시작 ---")
-        monthly_data = []
-        for i, code in enumerate(lawd_codes):
-            print(f"\r  [{i+1}/{len(lawd_codes)}] {code} 수집 중...", end="", flush=True)
-            region_data = fetch_data_for_region(session, code, month, SERVICE_KEY)
-            if region_data: monthly_data.extend(region_data)
-            
-            # [해결 방안 1] API 서버 부하 감소를 위해 지연 시간을 1초로 더 늘립니다.
-            time.sleep(1)
-        
+        # 완료 순서와 무관하게 지역 코드 순서대로 합쳐 결과 순서를 일정하게 유지합니다.
+        monthly_data = {}
+        for code in lawd_codes:
+            region_data = region_results[(month, code)]
+            if region_data: extend_columns(monthly_data, region_data)
+
         if not monthly_data:
             print(f"\n{month}월에 수집된 데이터가 없습니다.")
             continue
 
-        df_month = pd.DataFrame(monthly_data)
-        df_month.columns = df_month.columns.str.strip()
+        df_month = pd.DataFrame(monthly_data, copy=False)
         print(f"\n{month}월 데이터 총 {len(df_month)}건 수집 완료.")
         
-        added_count, df_existing = find_and_upload_new_data(df_month, df_existing, worksheet)
-        
-        if added_count > 0:
-            total_added_count += added_count
-            print(f"{month}월 데이터 중 {added_count}건 신규 추가 완료.")
-        elif added_count == 0:
+        newly_added_df = find_new_data(df_month, existing_ids)
+
+        if newly_added_df.empty:
             print(f"{month}월에는 신규 데이터가 없습니다.")
-        elif added_count == -1:
-            print(f"{month}월 데이터 처리 중 오류가 발생했습니다.")
+            continue
+        new_frames.append(newly_added_df)
+        print(f"{month}월 데이터 중 {len(newly_added_df)}건 신규 확인.")
+
+    total_added_count = 0
+    if new_frames:
+        # 달마다 열 구성이 다를 수 있으므로 합친 뒤 빈 칸은 빈 문자열로 채웁니다.
+        df_upload = pd.concat(new_frames, ignore_index=True).fillna('')
+        # 업로드가 중간에 실패해도 그 전까지 실제로 추가된 건수를 집계합니다.
+        total_added_count = upload_new_data(df_upload, worksheet, sheet_headers)
+        if total_added_count < len(df_upload):
+            print("신규 데이터 업로드 중 오류가 발생했습니다.")
 
     print(f"\n===== 전체 프로세스 완료! 총 {total_added_count}건의 신규 데이터 추가됨 =====")
 